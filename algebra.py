@@ -12,6 +12,10 @@ from itertools import accumulate
 #
 #     solveFor("a","b = (a+3)/4") --> "a=b*4-3"
 #
+# solveFor() walks a single occurrence of the term inward through its enclosing groups using a
+# parenthesis match index.  solveForLegacy() is the original substring/recursion implementation,
+# kept as the reference for output and throughput, and used when the term appears more than once.
+#
 
 def findGroups(expression):
     levels = list(accumulate(int(c=="(")-int(c==")") for c in expression))
@@ -22,7 +26,7 @@ def findGroups(expression):
 functionMap = [("sin","asin"),("cos","acos"),("tan","atan"),("log10","10**"),("exp","log")]
 functionMap += [ (b,a) for a,b in functionMap ]
     
-def solveFor(term,equation):
+def solveForLegacy(term,equation):
     equation = equation.replace(" ","").replace("**","†")
     termIn = re.compile(f"(^|\\W){term}($|\\W)")
     if len(termIn.findall(equation)) == 0: return None
@@ -64,7 +68,7 @@ def solveFor(term,equation):
     for gid,group in groups.items(): right = right.replace(gid,group)
     if left == termGroup:
         subEquation = groups[termGroup][1:-1]+"="+right
-        return solveFor(term,subEquation)
+        return solveForLegacy(term,subEquation)
     if left != term: return None
     solution = f"{left}={right}".replace("†","**")
     # expression clen-up
@@ -74,6 +78,118 @@ def solveFor(term,equation):
     solution = re.sub(r"(?<!\w)\((\w*)\)",r"\g<1>",solution)
     return solution 
 
+# precompiled patterns and inversion tables for solveFor()
+termPatterns    = {}
+parenthesis     = re.compile(r"[()]")
+cleanupPatterns = [ (re.compile(r"(?<!\w)(0\-)"),          "-"),
+                    (re.compile(r"1/\(1/(\w)\)"),          r"\g<1>"),
+                    (re.compile(r"\(\(([^\(]*)\)\)"),      r"(\g<1>)"),
+                    (re.compile(r"(?<!\w)\((\w*)\)"),      r"\g<1>") ]
+
+# operator --> inverse for the first operand / the others, split around {r} into (before,after)
+inverseOperators = [ ("+",["{r}-{x}"]*2),
+                     ("-",["{x}-{r}","{r}+{x}"]),
+                     ("*",["({r})/{x}"]*2),
+                     ("/",["{x}/({r})","({r})*{x}"]),
+                     ("†",["log({r})/log({x})","({r})†(1/{x})"]) ]
+inverseOperators = [ (oper,[tuple(p.split("{r}")) for p in inverses])
+                     for oper,inverses in inverseOperators ]
+
+# function name --> its inverse split around {r} into (before,after)
+inverseFunctions = { func:(f"{invFunc}(",")") for func,invFunc in functionMap }
+inverseFunctions.update( (sqrFunc,("(",")**2")) for sqrFunc in ["math.sqrt","sqrt"] )
+
+def solveFor(term,equation):
+    equation = equation.replace(" ","").replace("**","†")
+    if not term.isidentifier(): return solveForLegacy(term,equation)
+    termIn = termPatterns.get(term)
+    if termIn is None:
+        termIn = termPatterns[term] = re.compile(f"(?<!\\w){term}(?!\\w)")
+    found = termIn.search(equation)
+    if not found: return None
+    if termIn.search(equation,found.end()): return solveForLegacy(term,equation)
+    left,right = equation.split("=",1)
+    position   = found.start()
+    if position > len(left):
+        position -= len(left)+1
+        left,right = right,left
+    if "=" in left: return solveForLegacy(term,equation)
+
+    # parenthesis match index: position of "(" --> position of its ")"
+    matching,opened = {},[]
+    for paren in parenthesis.finditer(left):
+        if paren.group() == "(": opened.append(paren.start()); continue
+        if not opened: return solveForLegacy(term,equation)
+        matching[opened.pop()] = paren.start()
+    if opened: return solveForLegacy(term,equation)
+
+    # right side is accumulated as wrappers around the original right: before+right+after
+    before,after = [],[]
+    start,end    = 0,len(left)
+    while True:
+        # mask the groups of this level so operators and functions are only seen at its top
+        text,masked = left[start:end],[]
+        termAt      = position-start
+        termGroup   = None
+        adjacent    = False
+        done        = 0
+        opening     = text.find("(")
+        while opening >= 0:
+            closing   = matching[start+opening]-start
+            adjacent |= opening == done and done > 0
+            if opening < termAt < closing: termGroup = (opening,closing+1)
+            masked.append(text[done:opening])
+            masked.append("#"*(closing+1-opening))
+            done    = closing+1
+            opening = text.find("(",done)
+        masked.append(text[done:])
+        masked = "".join(masked)
+        if termGroup is None and adjacent: return None
+
+        keepFrom,keepTo = 0,len(text)
+        for oper,inverses in inverseOperators:
+            if oper not in masked[keepFrom:keepTo]: continue
+            pieceFrom = keepFrom
+            for i,piece in enumerate(masked[keepFrom:keepTo].split(oper)):
+                pieceTo = pieceFrom+len(piece)
+                if pieceFrom <= termAt < pieceTo:
+                    keep = (pieceFrom,pieceTo)
+                else:
+                    x = text[pieceFrom:pieceTo] or "0"
+                    if any(op in piece for op in "+-*/"): x = "("+x+")"
+                    invBefore,invAfter = inverses[i>0]
+                    before.append(invBefore.replace("{x}",x))
+                    after.append(invAfter.replace("{x}",x))
+                pieceFrom = pieceTo+1
+            keepFrom,keepTo = keep
+
+        fnEnd = masked.find("#",keepFrom,keepTo)
+        fn    = text[keepFrom:keepTo if fnEnd < 0 else fnEnd]
+        func  = fn.split(".")[-1]
+        if func in inverseFunctions:
+            invBefore,invAfter = inverseFunctions[func]
+            prefix = fn[:-len(func)]
+            if func in prefix:
+                right  = "".join(reversed(before))+right+"".join(after)
+                before,after = [],[]
+                prefix = prefix.replace(func,invBefore+right+invAfter)
+            before.append(prefix+invBefore)
+            after.append(invAfter)
+            keepFrom += len(fn)
+
+        if termGroup is None:
+            if text[keepFrom:keepTo] != term: return None
+            break
+        if (keepFrom,keepTo) != termGroup: return None
+        start,end = start+keepFrom+1,start+keepTo-1
+
+    right    = "".join(reversed(before))+right+"".join(after)
+    solution = f"{term}={right}".replace("†","**")
+    # expression clen-up
+    for pattern,replacement in cleanupPatterns:
+        solution = pattern.sub(replacement,solution)
+    return solution
+
 if __name__ == "__main__":
     print("FUNCTION (solveFor) TESTS:")
     print(solveFor("x","y=(a+b)*x-(math.sin(1.5)/322)"))   # 'x=(y+(math.sin(1.5)/322))/(a+b)'
@@ -91,6 +207,15 @@ if __name__ == "__main__":
     # tests for multi-instance terms
     print("multi-term: b=a*Z-a*3: ",solveFor("a","b=a*Z - a*3"))  # None... not supported
 
+    # throughput of solveFor against the original implementation
+    from timeit import timeit
+    samples = [ ("x","y=(a+b)*x-(math.sin(1.5)/322)"), ("a","q=(a**2+b**2)*(c-d)**2"),
+                ("a","c=(a**2+b**2)**(1/2)"), ("a","x=((a+b)*c-d)*(23+y)"),
+                ("a","y=-sin((x)-sqrt(a))") ]
+    for solver in [solveForLegacy,solveFor]:
+        seconds = timeit(lambda: [solver(term,eq) for term,eq in samples],number=2000)
+        print(f"{solver.__name__:>14}: {2000*len(samples)/seconds:,.0f} solutions/sec")
+
 
 ### EXPERIMENTAL - ADVANCED EQUATION SOLVER CLASS ###
 #